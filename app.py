@@ -5,6 +5,7 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
+import cache_bus
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -27,12 +28,16 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
     "pool_pre_ping": True,
 }
 
+# shared version table used to invalidate caches across worker processes
+app.config["CACHE_BUS_PATH"] = os.environ.get("CACHE_BUS_PATH")
+
 # initialize extensions
 db.init_app(app)
 login_manager.init_app(app)
 login_manager.login_view = 'auth.login'
 login_manager.login_message = 'Please log in to access this page.'
 login_manager.login_message_category = 'info'
+cache_bus.init_app(app)
 
 @login_manager.user_loader
 def load_user(user_id):
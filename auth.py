@@ -1,11 +1,14 @@
 import os
+import re
 import logging
+from fnmatch import translate
 from flask import Blueprint, render_template, request, flash, redirect, url_for, session
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import check_password_hash, generate_password_hash
 from models import User, Permission, AuditLog
 from app import db
 from utils import log_audit_event
+from cache_bus import register_cache
 from datetime import datetime
 
 auth_bp = Blueprint('auth', __name__)
@@ -102,8 +105,12 @@ def require_permission(permission_type):
             if current_user.is_admin:
                 return f(*args, **kwargs)
             
-            if permission_type == 'manage_groups' and current_user.can_manage_groups:
-                return f(*args, **kwargs)
+            if permission_type == 'manage_groups':
+                # Scoped managers pass here; routes narrow it down per group
+                if get_group_scope(current_user).grants_any:
+                    return f(*args, **kwargs)
+                flash('You do not have permission to access this resource.', 'error')
+                return redirect(url_for('main.dashboard'))
             
             # Check specific permissions
             permission = Permission.query.filter_by(
@@ -120,3 +127,93 @@ def require_permission(permission_type):
         decorated_function.__name__ = f.__name__
         return decorated_function
     return decorator
+
+
+class GroupScope:
+    """
+    Precompiled set of groups a user may manage, built from the user's flags
+    and their 'manage_groups' Permission rows. A user can always manage the
+    groups they created. Supported scope values:
+
+        (empty) or '*'        every group
+        'group:<id>'          a single group
+        'department:<name>'   groups created by someone in that department
+        'pattern:<glob>'      groups whose name matches the glob
+    """
+
+    def __init__(self, user, permissions):
+        self.user_id = user.id
+        self.all_groups = bool(user.is_admin or user.can_manage_groups)
+        self.group_ids = set()
+        self.departments = set()
+        patterns = []
+
+        for perm in permissions:
+            scope = (perm.scope or '').strip()
+            kind, _, value = scope.partition(':')
+            kind = kind.strip().lower()
+            value = value.strip()
+
+            if scope in ('', '*'):
+                self.all_groups = True
+            elif kind == 'group' and value.isdecimal():
+                self.group_ids.add(int(value))
+            elif kind == 'department' and value:
+                self.departments.add(value.lower())
+            elif kind == 'pattern' and value:
+                patterns.append(translate(value))
+            else:
+                logging.warning(f"Ignoring unrecognised permission scope {scope!r} for user {user.id}")
+
+        self.name_pattern = re.compile('|'.join(patterns), re.IGNORECASE) if patterns else None
+        self.grants_any = bool(self.all_groups or self.group_ids or self.departments or self.name_pattern)
+        self._decisions = {}
+
+    def allows(self, group):
+        """Check whether the scope covers an existing group"""
+        if self.all_groups or group.id in self.group_ids:
+            return True
+        if group.created_by_id == self.user_id:
+            return True
+
+        decision = self._decisions.get(group.id)
+        if decision is None:
+            creator = group.created_by
+            decision = self.allows_new(group.name, creator.department if creator else None)
+            self._decisions[group.id] = decision
+        return decision
+
+    def allows_new(self, name, department):
+        """Check whether the scope covers a group that does not exist yet"""
+        if self.all_groups:
+            return True
+        if department and department.lower() in self.departments:
+            return True
+        return bool(self.name_pattern and name and self.name_pattern.fullmatch(name))
+
+
+_group_scopes = {}
+
+def get_group_scope(user):
+    """Return the cached group scope for a user, compiling it on first use"""
+    scope = _group_scopes.get(user.id)
+    if scope is None:
+        permissions = Permission.query.filter_by(
+            user_id=user.id,
+            permission_type='manage_groups'
+        ).all()
+        scope = GroupScope(user, permissions)
+        _group_scopes[user.id] = scope
+    return scope
+
+@register_cache
+def invalidate_group_scope(user_id=None):
+    """Drop cached group scopes for one user, or for everyone"""
+    if user_id is None:
+        _group_scopes.clear()
+    else:
+        _group_scopes.pop(user_id, None)
+
+def can_manage_group(user, group):
+    """Check if a user can manage a specific group"""
+    return get_group_scope(user).allows(group)
@@ -0,0 +1,153 @@
+import os
+import logging
+import sqlite3
+import threading
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+# Columns and collections, per table, that in-process caches depend on.
+# group_members changes show up through the groups / members collections.
+# None means any change to the row counts. Inserts and deletes always count.
+TRACKED_ATTRIBUTES = {
+    'user': {'is_admin', 'can_manage_groups', 'department', 'active', 'groups'},
+    'distribution_group': {'name', 'created_by_id', 'active', 'members'},
+    'permission': None,
+}
+
+_invalidators = []
+_bus_path = None
+_seen_version = None
+_local = threading.local()
+
+
+def register_cache(invalidate):
+    """Register a callable that clears an in-process cache"""
+    _invalidators.append(invalidate)
+    return invalidate
+
+
+def invalidate_local():
+    """Clear every registered cache in this process"""
+    for invalidate in _invalidators:
+        try:
+            invalidate()
+        except Exception as e:
+            logging.error(f"Error invalidating cache {invalidate!r}: {e}")
+
+
+def _connect():
+    """
+    Return this thread's connection to the version table. Connections are
+    never shared across a fork, so workers forked from a preloaded master
+    open their own.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.pid != os.getpid():
+        conn = sqlite3.connect(_bus_path, timeout=5, isolation_level=None)
+        _local.conn = conn
+        _local.pid = os.getpid()
+    return conn
+
+
+def _read_version():
+    row = _connect().execute('SELECT version FROM cache_version WHERE id = 1').fetchone()
+    return row[0] if row else 0
+
+
+def sync():
+    """Clear local caches if another worker has published a change"""
+    global _seen_version
+    try:
+        version = _read_version()
+    except sqlite3.Error as e:
+        # Without the bus we cannot trust anything we have cached
+        logging.error(f"Error reading cache version: {e}")
+        invalidate_local()
+        return
+
+    if version != _seen_version:
+        if _seen_version is not None:
+            invalidate_local()
+        _seen_version = version
+
+
+def publish():
+    """Clear local caches and tell the other workers to do the same"""
+    global _seen_version
+    invalidate_local()
+    if not _bus_path:
+        return
+
+    try:
+        conn = _connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('UPDATE cache_version SET version = version + 1 WHERE id = 1')
+            _seen_version = conn.execute('SELECT version FROM cache_version WHERE id = 1').fetchone()[0]
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    except sqlite3.Error as e:
+        logging.error(f"Error publishing cache invalidation: {e}")
+
+
+def _is_relevant_change(obj):
+    table = getattr(obj, '__tablename__', None)
+    if table not in TRACKED_ATTRIBUTES:
+        return False
+
+    attributes = TRACKED_ATTRIBUTES[table]
+    if attributes is None:
+        return True
+
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_changes(session, flush_context):
+    # History is still intact in after_flush, so last_login updates and the
+    # like can be told apart from changes that affect cached data
+    for obj in (*session.new, *session.deleted):
+        if getattr(obj, '__tablename__', None) in TRACKED_ATTRIBUTES:
+            session.info['cache_bus_dirty'] = True
+            return
+
+    for obj in session.dirty:
+        if _is_relevant_change(obj):
+            session.info['cache_bus_dirty'] = True
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_changes(session):
+    if session.info.pop('cache_bus_dirty', False):
+        publish()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('cache_bus_dirty', None)
+
+
+def init_app(app):
+    """
+    Enable cross-process invalidation when CACHE_BUS_PATH is configured.
+    Without it, commits still clear this process's caches.
+    """
+    global _bus_path
+    _bus_path = app.config.get('CACHE_BUS_PATH')
+    if not _bus_path:
+        return
+
+    conn = sqlite3.connect(_bus_path, timeout=5, isolation_level=None)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_version '
+                     '(id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)')
+        conn.execute('INSERT OR IGNORE INTO cache_version (id, version) VALUES (1, 0)')
+    finally:
+        conn.close()
+
+    app.before_request(sync)
@@ -0,0 +1,21 @@
+# Multi-worker deployment: gunicorn -c gunicorn.conf.py main:app
+import os
+import tempfile
+import multiprocessing
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count(), 8)))
+
+# Import the app once in the master so db.create_all() and the cache bus
+# setup run a single time instead of racing in every worker
+preload_app = True
+
+# Workers keep caches in memory; the cache bus keeps them consistent
+os.environ.setdefault("CACHE_BUS_PATH", os.path.join(tempfile.gettempdir(), "distribution_groups_cache_bus.db"))
+
+
+def post_fork(server, worker):
+    # Pooled connections opened in the master must not be shared with workers
+    from app import app, db
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -2,7 +2,7 @@ from flask import Blueprint, render_template, request, flash, redirect, url_for,
 from flask_login import login_required, current_user
 from models import User, DistributionGroup, Permission, AuditLog
 from app import db
-from auth import require_permission
+from auth import require_permission, can_manage_group, get_group_scope
 from utils import log_audit_event, generate_pdf_report
 from datetime import datetime, timedelta
 import json
@@ -64,8 +64,7 @@ def group_detail(group_id):
     members = group.members
     
     # Check if user can manage this group
-    can_manage = (current_user.is_admin or current_user.can_manage_groups or
-                  group.created_by_id == current_user.id)
+    can_manage = can_manage_group(current_user, group)
     
     return render_template('group_detail.html', group=group, members=members, can_manage=can_manage)
 
@@ -74,6 +73,10 @@ def group_detail(group_id):
 @require_permission('manage_groups')
 def add_group_member(group_id):
     group = DistributionGroup.query.get_or_404(group_id)
+    if not can_manage_group(current_user, group):
+        flash('You do not have permission to manage this group.', 'error')
+        return redirect(url_for('main.group_detail', group_id=group_id))
+    
     user_id = request.form.get('user_id')
     
     if not user_id:
@@ -103,6 +106,10 @@ def add_group_member(group_id):
 @require_permission('manage_groups')
 def remove_group_member(group_id):
     group = DistributionGroup.query.get_or_404(group_id)
+    if not can_manage_group(current_user, group):
+        flash('You do not have permission to manage this group.', 'error')
+        return redirect(url_for('main.group_detail', group_id=group_id))
+    
     user_id = request.form.get('user_id')
     
     user = User.query.get(user_id)
@@ -260,6 +267,10 @@ def create_group():
         flash('Group name and email are required.', 'error')
         return redirect(url_for('main.groups'))
     
+    if not get_group_scope(current_user).allows_new(name, current_user.department):
+        flash('You do not have permission to create this group.', 'error')
+        return redirect(url_for('main.groups'))
+    
     # Check if group already exists
     existing_group = DistributionGroup.query.filter_by(name=name).first()
     if existing_group: